@@ -12,15 +12,25 @@ limitations under the License.
 """
 
 import os
-import pickle
+import sys
+import math
+import pathlib
 import dataclasses
 import numpy as np
+import pandas as pd
+from operator import attrgetter, itemgetter
 from typing import Union, Dict, List
 from utils.utils import CommType, CommGroup
-from log_analyzer.utils import convert_size_to_msg, calc_bw_log
+from log_analyzer.utils import convert_size_to_msg, calc_bw_log, calc_bw_log_batch
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class LogItem:
     comm_type: CommType = dataclasses.field(default=None)
     comm_group: CommGroup = dataclasses.field(default=None)
@@ -43,10 +53,8 @@ class LogItem:
 
     @elapsed_time.setter
     def elapsed_time(self, elapsed_time):
+        # algbw / busbw are filled in batch by Log.finalize
         self._elapsed_time = elapsed_time
-        self.algbw, self.busbw = calc_bw_log(
-            self.comm_type, self.msg_size, elapsed_time
-        )
 
     def is_epoch_end(self):
         return self.comm_type == CommType.epoch_end
@@ -55,18 +63,21 @@ class LogItem:
         return self.elapsed_time is None
 
     def view_as_ds_log(self):
+        algbw, busbw = self.algbw, self.busbw
+        if algbw is None:
+            algbw, busbw = calc_bw_log(self.comm_type, self.msg_size, self.elapsed_time)
         log_str = f"[RANK 0] comm op: {self.comm_type} | comm group: {self.comm_group}"
         log_str += " | time (ms): {:.2f}".format(self.elapsed_time)
         log_str += " | msg size: " + convert_size_to_msg(self.msg_size)
-        log_str += " | algbw (Gbps): {:.2f} ".format(self.algbw)
-        log_str += " | busbw (Gbps): {:.2f} ".format(self.busbw)
+        log_str += " | algbw (Gbps): {:.2f} ".format(algbw)
+        log_str += " | busbw (Gbps): {:.2f} ".format(busbw)
         return log_str
 
     def csv_header(self):
-        return ",".join([k for k in self.__dict__.keys()])
+        return _CSV_HEADER
 
     def view_as_csv_line(self):
-        return ",".join([str(getattr(self, k)) for k in self.__dict__.keys()])
+        return ",".join(map(str, _FIELD_GET(self)))
 
     def __str__(self):
         if self.is_workload():
@@ -74,6 +85,11 @@ class LogItem:
         return "None"
 
 
+_FIELD_NAMES = tuple(field.name for field in dataclasses.fields(LogItem))
+_FIELD_GET = attrgetter(*_FIELD_NAMES)
+_CSV_HEADER = ",".join(_FIELD_NAMES)
+
+
 def _print_stage_log(
     stage_name: str,
     stage_count: int,
@@ -82,95 +98,467 @@ def _print_stage_log(
     agg_key: List[str],
     performance_key: List[str],
 ):
-    log_str = ""
+    parts = []
+    # the same message sizes show up under many comm types
+    size_msgs = {}
     for pkey in sorted(comm_type_info.keys()):
-        log_str += f"stage: {stage_name}"
+        parts.append(f"stage: {stage_name}")
         for i, pkey_name in enumerate(primary_key):
-            value = pkey[i] if pkey_name != "msg_size" else convert_size_to_msg(pkey[i])
-            log_str += f" | {pkey_name}: {value}"
+            value = pkey[i]
+            if pkey_name == "msg_size":
+                if value not in size_msgs:
+                    size_msgs[value] = convert_size_to_msg(value)
+                value = size_msgs[value]
+            parts.append(f" | {pkey_name}: {value}")
         for key in agg_key:
             value = comm_type_info[pkey][key]
             value = convert_size_to_msg(value) if key == "msg_size" else f"{value:.2f}"
-            log_str += f" | {key}: {value}"
+            parts.append(f" | {key}: {value}")
         for key in performance_key:
-            performance_value_list = sorted(comm_type_info[pkey][key])
-            log_str += f" | {key}: {np.mean(performance_value_list):.2f}±{np.std(performance_value_list):.2f}"
-            log_str += f" | min{key}: {performance_value_list[0]:.2f}"
-            log_str += f" | max{key}: {performance_value_list[-1]:.2f}"
-            log_str += f" | p90{key}: {performance_value_list[-len(performance_value_list)//9]:.2f}"
-        log_str += "\n"
-    return log_str
-
-
-def _analyze_stage_log(comm_log: List[Dict], stage: str, comm_info: Dict[str, Dict]):
-    def __update_info(
-        info_dict,
-        log,
-        primary_key: List[str],
-        agg_key: List[str],
-        performance_key: List[str],
-    ):
-        primary_key = tuple(log[key] for key in primary_key)
-        if primary_key not in info_dict:
-            info_dict[primary_key] = dict((key, 0) for key in agg_key)
-            info_dict[primary_key].update(dict((key, []) for key in performance_key))
-        for key in agg_key:
-            info_dict[primary_key][key] += log[key]
-        for key in performance_key:
-            info_dict[primary_key][key].append(log[key])
+            values = comm_type_info[pkey][key]
+            arr = np.fromiter(values, dtype=np.float64, count=len(values))
+            # nearest-rank p90, selected in O(n) instead of sorting the whole list
+            k90 = math.ceil(0.9 * len(arr)) - 1
+            parts.append(f" | {key}: {arr.mean():.2f}±{arr.std():.2f}")
+            parts.append(f" | min{key}: {arr.min():.2f}")
+            parts.append(f" | max{key}: {arr.max():.2f}")
+            parts.append(f" | p90{key}: {np.partition(arr, k90)[k90]:.2f}")
+        parts.append("\n")
+    return "".join(parts)
+
+
+_COMM_LOG_DIR = "results/comm_logs/"
+_WORKLOAD_DIR = "results/mocked_workload/"
+
+
+def _ensure_dir(path: str):
+    # one mkdir call instead of an exists() stat and makedirs(), run on every
+    # dump: the folder may have been removed or the working directory changed
+    pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+
+
+_COMM_TYPES = tuple(CommType)
+_COMM_GROUPS = tuple(CommGroup)
+# code -1 stands for an unset (None) field and indexes the trailing None
+_COMM_TYPE_CODES = {comm_type: i for i, comm_type in enumerate(_COMM_TYPES)}
+_COMM_GROUP_CODES = {comm_group: i for i, comm_group in enumerate(_COMM_GROUPS)}
+_COMM_TYPE_CODES[None] = _COMM_GROUP_CODES[None] = -1
+_COMM_TYPES += (None,)
+_COMM_GROUPS += (None,)
+_COMM_TYPE_NAMES = np.array([str(comm_type) for comm_type in _COMM_TYPES])
+_COMM_GROUP_NAMES = np.array([str(comm_group) for comm_group in _COMM_GROUPS])
+_COMM_TYPE_VALUES = np.array([getattr(ct, "value", "") for ct in _COMM_TYPES])
+_EPOCH_END = CommType.epoch_end
+_EPOCH_END_CODE = _COMM_TYPE_CODES[_EPOCH_END]
+# (comm_type, comm_group) packed into one uint16 grouping key:
+# high byte comm_type code + 1, low byte comm_group code + 1 (0 for None)
+_COMM_KEYS = {
+    (comm_type, comm_group): (ct_code + 1) << 8 | (cg_code + 1)
+    for comm_type, ct_code in _COMM_TYPE_CODES.items()
+    for comm_group, cg_code in _COMM_GROUP_CODES.items()
+}
+_COMM_KEY_PAIRS = {key: pair for pair, key in _COMM_KEYS.items()}
+
+# numpy dtype of every LogItem column in _FIELD_NAMES order, enums are stored
+# as their int8 codes and fields without a numeric dtype as objects
+_COLUMN_DTYPES = {
+    "comm_type": np.int8,
+    "comm_group": np.int8,
+    "comm_group_size": object,
+    "msg_size": np.int64,
+    "stage": object,
+    "dst": object,
+    "src": object,
+    "additional": object,
+    "_elapsed_time": np.float64,
+    "algbw": np.float64,
+    "busbw": np.float64,
+    "count": np.int64,
+}
+_NULLABLE_FIELDS = ("_elapsed_time", "algbw", "busbw")
+# python types stored unchanged by a dtype kind, None becomes nan
+_NATIVE_TYPES = {
+    "i": {int, np.int64},
+    "f": {float, int, np.float64, np.int64, type(None)},
+}
+
+
+class _Column:
+    """Growable numpy buffer, doubles its capacity when full.
+
+    A chunk of another dtype turns the buffer into an object buffer, so ints
+    and floats logged to the same field keep their python type.
+    """
+
+    def __init__(self, dtype, capacity: int = 0) -> None:
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def reserve(self, capacity: int):
+        if capacity > len(self.data):
+            data = np.empty(capacity, dtype=self.data.dtype)
+            data[: self.size] = self.data[: self.size]
+            self.data = data
+
+    def extend(self, values: np.ndarray):
+        if values.dtype != self.data.dtype:
+            dtype = values.dtype if self.size == 0 else object
+            self.data, values = self.data.astype(dtype), values.astype(dtype)
+        end = self.size + len(values)
+        if end > len(self.data):
+            self.reserve(max(2 * len(self.data), end, 1024))
+        self.data[self.size : end] = values
+        self.size = end
+
+    def values(self) -> np.ndarray:
+        return self.data[: self.size]
 
+    @staticmethod
+    def from_array(values: np.ndarray) -> "_Column":
+        column = _Column(values.dtype)
+        column.data, column.size = np.array(values), len(values)
+        return column
+
+
+def _object_array(values: list) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _column_array(values: list, dtype) -> np.ndarray:
+    """Column of one field's values, which keep their python type.
+
+    A field of floats only is stored as float64 whatever its dtype, ints mixed
+    with floats or computation shapes as objects: WorkloadApplyer checks
+    isinstance(msg_size, int), so a dump / load must not turn ints into floats.
+    """
+    kind = np.dtype(dtype).kind
+    if kind != "O":
+        types = set(map(type, values))
+        if types <= _NATIVE_TYPES[kind]:
+            return np.array(values, dtype=dtype)
+        if types <= {float, np.float64}:
+            return np.array(values, dtype=np.float64)
+    return _object_array(values)
+
+
+def _rows_to_columns(rows: List[tuple]) -> Dict[str, np.ndarray]:
+    """Columns of LogItem field tuples (_FIELD_GET of the items)."""
+    columns = {}
+    for i, (name, dtype) in enumerate(_COLUMN_DTYPES.items()):
+        values = list(map(itemgetter(i), rows))
+        if name == "comm_type":
+            values = list(map(_COMM_TYPE_CODES.__getitem__, values))
+        elif name == "comm_group":
+            values = list(map(_COMM_GROUP_CODES.__getitem__, values))
+        columns[name] = _column_array(values, dtype)
+    return columns
+
+
+def _items_to_columns(items: List[LogItem]) -> Dict[str, np.ndarray]:
+    return _rows_to_columns(list(map(_FIELD_GET, items)))
+
+
+def _comm_keys(comm_type: np.ndarray, comm_group: np.ndarray) -> np.ndarray:
+    # _COMM_KEYS packing, over code columns
+    return ((comm_type.astype(np.int32) + 1) << 8 | (comm_group + 1)).astype(np.uint16)
+
+
+def _csv_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    columns = {name: columns[name] for name in _FIELD_NAMES}
+    # keep the str() rendering of LogItem.view_as_csv_line for enum fields
+    columns["comm_type"] = _COMM_TYPE_NAMES[columns["comm_type"]]
+    columns["comm_group"] = _COMM_GROUP_NAMES[columns["comm_group"]]
+    return columns
+
+
+def _csv_cells(values: np.ndarray) -> list:
+    # nan marks an unset field, written as None like LogItem.view_as_csv_line
+    if values.dtype.kind == "f" or values.dtype == object:
+        mask = pd.isna(values)
+        if mask.any():
+            values = values.astype(object)
+            values[mask] = None
+    return values.tolist()
+
+
+def _write_csv(columns: Dict[str, np.ndarray], csv_filename: str):
+    """Write columns as LogItem.view_as_csv_line rows, in a single write."""
+    rows = zip(*map(_csv_cells, _csv_columns(columns).values()))
+    with open(csv_filename, "w") as f:
+        f.write(_CSV_HEADER + "\n")
+        f.write("".join([",".join(map(str, row)) + "\n" for row in rows]))
+
+
+def _arrow_csv_column(values: np.ndarray):
+    if values.dtype.kind == "i":
+        return pa.array(values)
+    # astype(str) renders floats and objects as str() does in _write_csv, so
+    # the file is the same whichever writer produced it
+    return pa.array(values.astype(str), mask=pd.isna(values))
+
+
+def _write_csv_arrow(columns: Dict[str, np.ndarray], csv_filename: str) -> bool:
+    """Write columns with pyarrow's multithreaded csv writer.
+
+    Returns False for an object msg_size column (computation shapes) or a
+    cell that would need quoting, the caller then falls back to _write_csv."""
+    if columns["msg_size"].dtype == object:
+        return False
+    write_options = pa_csv.WriteOptions(
+        batch_size=1 << 16,
+        null_string="None",
+        quoting_style="none",
+        quoting_header="none",
+    )
+    try:
+        table = pa.table(
+            {
+                name: _arrow_csv_column(values)
+                for name, values in _csv_columns(columns).items()
+            }
+        )
+        pa_csv.write_csv(table, csv_filename, write_options=write_options)
+    except (pa.ArrowException, ValueError):
+        return False
+    return True
+
+
+def _columns_to_items(columns: Dict[str, np.ndarray]) -> List[LogItem]:
+    columns = {name: columns[name].tolist() for name in _FIELD_NAMES}
+    columns["comm_type"] = [_COMM_TYPES[code] for code in columns["comm_type"]]
+    columns["comm_group"] = [_COMM_GROUPS[code] for code in columns["comm_group"]]
+    for name in _NULLABLE_FIELDS:
+        columns[name] = [None if v != v else v for v in columns[name]]
+    return [LogItem(*row) for row in zip(*columns.values())]
+
+
+def _groupby(df: pd.DataFrame, keys: List[str], sum_keys: List[str]):
+    """Group df by keys.
+
+    Returns the group keys, the per group sum of every sum_keys column and
+    the per group list of elapsed times."""
+    n = len(df)
+    if n == 0:
+        return [], [[] for _ in sum_keys], []
+    # the same op is usually logged back to back: only the first row of every
+    # run of equal keys gets hashed, the rest of the run joins its group
+    new_run = np.ones(n, dtype=bool)
+    for key in keys:
+        values = df[key].to_numpy()
+        new_run[1:] |= values[1:] != values[:-1]
+    run_starts = np.flatnonzero(new_run)
+    runs = df[keys].iloc[run_starts]
+    grouper = runs.groupby(keys, sort=False)
+    run_group_ids, n_groups = grouper.ngroup().to_numpy(), grouper.ngroups
+    sums = []
+    for key in sum_keys:
+        run_sums = np.add.reduceat(df[key].to_numpy(), run_starts)
+        group_sums = np.zeros(n_groups, dtype=run_sums.dtype)
+        np.add.at(group_sums, run_group_ids, run_sums)
+        sums.append(group_sums.tolist())
+    # groups are numbered in order of appearance, so this picks their first run
+    _, first_runs = np.unique(run_group_ids, return_index=True)
+    group_keys = runs.iloc[first_runs].itertuples(index=False, name=None)
+    # rows of every group become contiguous after a stable sort on group id
+    group_ids = np.repeat(run_group_ids, np.diff(np.append(run_starts, n)))
+    order = np.argsort(group_ids, kind="stable")
+    group_sizes = np.bincount(group_ids, minlength=n_groups)
+    elapsed_time = np.split(
+        df["_elapsed_time"].to_numpy()[order], np.cumsum(group_sizes)[:-1]
+    )
+    return list(group_keys), sums, [values.tolist() for values in elapsed_time]
+
+
+def _update_comm_type_info(info_dict: Dict, df: pd.DataFrame):
+    group_keys, (counts, msg_sizes), elapsed_times = _groupby(
+        df, ["comm_key"], ["count", "msg_size"]
+    )
+    for (comm_key,), count, msg_size, elapsed_time in zip(
+        group_keys, counts, msg_sizes, elapsed_times
+    ):
+        key = _COMM_KEY_PAIRS[comm_key]
+        info = info_dict.get(key)
+        if info is None:
+            info = info_dict[key] = {"count": 0, "msg_size": 0, "_elapsed_time": []}
+        info["count"] += count
+        info["msg_size"] += msg_size
+        info["_elapsed_time"].extend(elapsed_time)
+
+
+def _update_detailed_comm_type_info(info_dict: Dict, df: pd.DataFrame):
+    group_keys, (counts,), elapsed_times = _groupby(
+        df, ["comm_key", "msg_size"], ["count"]
+    )
+    for (comm_key, msg_size), count, elapsed_time in zip(
+        group_keys, counts, elapsed_times
+    ):
+        key = _COMM_KEY_PAIRS[comm_key] + (msg_size,)
+        info = info_dict.get(key)
+        if info is None:
+            info = info_dict[key] = {"count": 0, "_elapsed_time": []}
+        info["count"] += count
+        info["_elapsed_time"].extend(elapsed_time)
+
+
+def _analyze_stage_log(
+    columns: Dict[str, np.ndarray],
+    mask: np.ndarray,
+    stage: str,
+    comm_info: Dict[str, Dict],
+    stage_count: int = 1,
+):
     if stage not in comm_info:
         comm_info[stage] = {
             "count": 0,
             "comm_type_info": {},
             "detailed_comm_type_info": {},
         }
-    comm_info[stage]["count"] += 1
+    comm_info[stage]["count"] = stage_count
+    # comm_type / comm_group are grouped by their packed key and decoded after
+    df = pd.DataFrame(
+        {
+            key: columns[key][mask]
+            for key in ("comm_key", "msg_size", "count", "_elapsed_time")
+        }
+    )
     # key: comm_type, value: count, time_ms
-    comm_type_info = comm_info[stage]["comm_type_info"]
+    _update_comm_type_info(comm_info[stage]["comm_type_info"], df)
     # key: comm_type, msg_size, value: count, time_ms
-    detailed_comm_type_info = comm_info[stage]["detailed_comm_type_info"]
-    for log in comm_log:
-        __update_info(
-            comm_type_info,
-            log.__dict__,
-            ["comm_type", "comm_group"],
-            ["count", "msg_size"],
-            ["_elapsed_time"],
-        )
-        __update_info(
-            detailed_comm_type_info,
-            log.__dict__,
-            ["comm_type", "comm_group", "msg_size"],
-            ["count"],
-            ["_elapsed_time"],
-        )
+    _update_detailed_comm_type_info(comm_info[stage]["detailed_comm_type_info"], df)
+
+
+def _copy_comm_info(comm_info: Dict[str, Dict]) -> Dict[str, Dict]:
+    # copy down to the elapsed time lists, which later analyze calls extend
+    snapshot = {}
+    for stage, stage_info in comm_info.items():
+        snapshot[stage] = {"count": stage_info["count"]}
+        for name in ("comm_type_info", "detailed_comm_type_info"):
+            snapshot[stage][name] = {
+                key: {**info, "_elapsed_time": list(info["_elapsed_time"])}
+                for key, info in stage_info[name].items()
+            }
+    return snapshot
 
 
 class Log:
     def __init__(self) -> None:
-        self.comm_logs = []
-        self.comm_log_each_epoch = [[]]
+        self._columns = {name: _Column(dtype) for name, dtype in _COLUMN_DTYPES.items()}
+        self._columns["comm_key"] = _Column(np.uint16)
+        # epoch of every row, -1 for the epoch_end closing an epoch
+        self._columns["epoch_id"] = _Column(np.int32)
+        # fields of the items logged since the columns were last read, they are
+        # moved into the columns in bulk so logging stays a list append
+        self._rows = []
+        self._row_epochs = []
+        self._epoch = 0
+        # whether ops were logged since the last epoch_end
+        self._epoch_open = False
         self.epoch_times = []
+        # aggregates of the rows analyzed so far, extended by later analyze calls
+        self._comm_info: Dict[str, Dict] = {}
+        self._analyzed_rows = 0
+
+    def reserve(self, n: int):
+        """Pre-size the column buffers for n rows in total, for callers that
+        know how many items will be logged."""
+        for column in self._columns.values():
+            column.reserve(n)
+
+    def __len__(self) -> int:
+        return self._columns["epoch_id"].size + len(self._rows)
 
     def add_comm_log(self, comm_log: LogItem):
-        if (
-            comm_log.is_epoch_end()
-            and len(self.comm_logs) > 0
-            and not self.comm_logs[-1].is_epoch_end()
-        ):
-            self.comm_logs.append(comm_log)
-            self.comm_log_each_epoch.append([])
+        # runs after every benchmarked op, keep it to a few list appends
+        epoch = self._epoch
+        if comm_log.comm_type != _EPOCH_END:
+            self._epoch_open = True
+        elif self._epoch_open:
+            epoch = -1
+            self._epoch += 1
+            self._epoch_open = False
             self.epoch_times.append(comm_log.elapsed_time)
+        # a tuple of the current values, the caller may reuse the item
+        self._rows.append(_FIELD_GET(comm_log))
+        self._row_epochs.append(epoch)
+
+    def _flush(self):
+        if not self._rows:
             return
-        self.comm_logs.append(comm_log)
-        self.comm_log_each_epoch[-1].append(comm_log)
+        columns = _rows_to_columns(self._rows)
+        columns["comm_key"] = _comm_keys(columns["comm_type"], columns["comm_group"])
+        columns["epoch_id"] = np.array(self._row_epochs, dtype=np.int32)
+        for name, values in columns.items():
+            self._columns[name].extend(values)
+        self._rows, self._row_epochs = [], []
+
+    def _get_columns(self) -> Dict[str, np.ndarray]:
+        self._flush()
+        return {name: column.values() for name, column in self._columns.items()}
+
+    def _to_columns(self) -> Dict[str, np.ndarray]:
+        columns = self._get_columns()
+        columns["epoch_times"] = np.asarray(self.epoch_times, dtype=np.float64)
+        return columns
+
+    @staticmethod
+    def _from_columns(columns: Dict[str, np.ndarray]) -> "Log":
+        log = Log()
+        for name in log._columns:
+            log._columns[name] = _Column.from_array(columns[name])
+        log.epoch_times = columns["epoch_times"].tolist()
+        log._epoch = len(log.epoch_times)
+        comm_type = columns["comm_type"]
+        log._epoch_open = len(comm_type) > 0 and comm_type[-1] != _EPOCH_END_CODE
+        return log
+
+    def __reduce__(self):
+        # pickle the trimmed column buffers, not the python objects around them
+        return Log._from_columns, (self._to_columns(),)
+
+    @property
+    def comm_logs(self) -> List[LogItem]:
+        return _columns_to_items(self._to_columns())
+
+    @property
+    def comm_log_each_epoch(self) -> List[List[LogItem]]:
+        epoch_id = self._get_columns()["epoch_id"]
+        comm_log_each_epoch = [[] for _ in range(self._epoch + 1)]
+        for epoch, log_item in zip(epoch_id.tolist(), self.comm_logs):
+            if epoch >= 0:
+                comm_log_each_epoch[epoch].append(log_item)
+        return comm_log_each_epoch
+
+    def finalize(self):
+        """Fill algbw / busbw of every logged op that has no bandwidth yet."""
+        columns = self._get_columns()
+        algbw, busbw = columns["algbw"], columns["busbw"]
+        msg_size = columns["msg_size"]
+        if msg_size.dtype == object:
+            # computation shapes carry no message size
+            msg_size = np.array(
+                [v if isinstance(v, (int, float, np.number)) else np.nan for v in msg_size],
+                dtype=np.float64,
+            )
+        rows = np.isnan(algbw) & ~np.isnan(columns["_elapsed_time"])
+        comm_type = _COMM_TYPE_VALUES[columns["comm_type"][rows]]
+        algbw[rows], busbw[rows] = calc_bw_log_batch(
+            comm_type, msg_size[rows], columns["_elapsed_time"][rows]
+        )
 
     def analyze(self, print_fn=print):
-        comm_info: Dict[str, Dict] = {}
-        _analyze_stage_log(self.comm_log_each_epoch[0], "init", comm_info)
-        for e_log in self.comm_log_each_epoch[1:]:
-            _analyze_stage_log(e_log, "train", comm_info)
+        comm_info = self._comm_info
+        # only rows logged since the previous call are grouped and merged in
+        columns = {
+            name: values[self._analyzed_rows :]
+            for name, values in self._get_columns().items()
+        }
+        epoch_id = columns["epoch_id"]
+        _analyze_stage_log(columns, epoch_id == 0, "init", comm_info)
+        if self._epoch > 0:
+            _analyze_stage_log(columns, epoch_id > 0, "train", comm_info, self._epoch)
+        self._analyzed_rows += len(epoch_id)
         for stage in comm_info.keys():
             stage_count = comm_info[stage]["count"]
             comm_type_info = comm_info[stage]["comm_type_info"]
@@ -200,29 +588,30 @@ class Log:
                 ["_elapsed_time"],
             )
             print_fn(log_str)
-        return comm_info
+        # the cache keeps growing with later calls, hand out a snapshot
+        return _copy_comm_info(comm_info)
 
     def dump(self, filename):
-        default_comm_folder_path = "results/comm_logs/"
-        if not os.path.exists(default_comm_folder_path):
-            os.makedirs(default_comm_folder_path, exist_ok=True)
+        _ensure_dir(_COMM_LOG_DIR)
         if "." in filename:
             filename = filename.split(".")[0]
-        filename = os.path.join("results/comm_logs/", filename)
+        filename = os.path.join(_COMM_LOG_DIR, filename)
+        self.finalize()
+        columns = self._to_columns()
         csv_filename = filename + "_log.csv"
-        with open(csv_filename, "w") as f:
-            f.write(self.comm_logs[0].csv_header() + "\n")
-            for log_item in self.comm_logs:
-                f.write(log_item.view_as_csv_line() + "\n")
-        pkl_filename = filename + "_log.pkl"
-        pickle.dump(self, open(pkl_filename, "wb"))
+        if pa is None or not _write_csv_arrow(columns, csv_filename):
+            _write_csv(columns, csv_filename)
+        npz_filename = filename + "_log.npz"
+        np.savez_compressed(npz_filename, **columns)
 
     @staticmethod
     def load(filename):
         filename = filename.split(".")
-        filename[-1] = "pkl"
+        filename[-1] = "npz"
         filename = ".".join(filename)
-        return pickle.load(open(filename, "rb"))
+        # object columns (stage, additional, ...) are stored pickled
+        with np.load(filename, allow_pickle=True) as columns:
+            return Log._from_columns(dict(columns))
 
     def _get_elapsed_time(self):
         return self.epoch_times
@@ -231,18 +620,13 @@ class Log:
         print_fn(f"--------------------------------------------------------")
         print_fn("result for epoch time ")
         print_fn(f"init time is {self.epoch_times[0]:.2f}")
-        self.epoch_times.pop(0)
-        max_val = max(self.epoch_times)
-        min_val = min(self.epoch_times)
-        mean_val = sum(self.epoch_times) / len(self.epoch_times)
-
-        variance = sum((x - mean_val) ** 2 for x in self.epoch_times) / len(
-            self.epoch_times
-        )
+        epoch_times = np.asarray(self.epoch_times[1:], dtype=np.float64)
+        max_val, min_val = epoch_times.max(), epoch_times.min()
+        mean_val, variance = epoch_times.mean(), epoch_times.var()
 
-        sorted_list = sorted(self.epoch_times)
-        p90_val = sorted_list[int(len(sorted_list) * 0.9)]
-        p99_val = sorted_list[int(len(sorted_list) * 0.99)]
+        k90, k99 = int(len(epoch_times) * 0.9), int(len(epoch_times) * 0.99)
+        epoch_times = np.partition(epoch_times, [k90, k99])
+        p90_val, p99_val = epoch_times[k90], epoch_times[k99]
 
         print_fn(f"max iteration time {max_val:.2f}")
         print_fn(f"min iteration time {min_val:.2f}")
@@ -262,6 +646,10 @@ class Workload:
             return
         if "stage" not in log_item:
             log_item["stage"] = log_item["operation"] if "operation" in log_item else ""
+        # stage / additional repeat across layers and iterations, share one copy
+        for key in ("stage", "additional"):
+            if isinstance(log_item.get(key), str):
+                log_item[key] = sys.intern(log_item[key])
         if "comm_group" not in log_item:
             assert (
                 log_item["comm_type"] == CommType.computation
@@ -285,26 +673,25 @@ class Workload:
 
     def dump(self, args, filename):
         folder_path = os.path.dirname(filename)
-        if folder_path and not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-        default_folder_path = "results/mocked_workload/"
-        if not os.path.exists(default_folder_path):
-            os.makedirs(default_folder_path, exist_ok=True)
+        if folder_path:
+            _ensure_dir(folder_path)
+        _ensure_dir(_WORKLOAD_DIR)
         if "." in filename:
             filename = os.path.basename(filename).split(".")[0]
-        filename = os.path.join("results/mocked_workload/", filename)
-        pkl_filename = filename + "_workload.pkl"
-        pickle.dump((self, args), open(pkl_filename, "wb"))
+        filename = os.path.join(_WORKLOAD_DIR, filename)
+        columns = _items_to_columns(self.workload)
+        npz_filename = filename + "_workload.npz"
+        np.savez_compressed(npz_filename, args=np.array(args, dtype=object), **columns)
         csv_filename = filename + "_workload.csv"
-        with open(csv_filename, "w") as f:
-            f.write(self.workload[0].csv_header() + "\n")
-            for log_item in self.workload:
-                f.write(log_item.view_as_csv_line() + "\n")
+        _write_csv(columns, csv_filename)
 
     @staticmethod
     def load(filename):
         filename = filename.split(".")
-        filename[-1] = "pkl"
+        filename[-1] = "npz"
         filename = ".".join(filename)
-        workload, args = pickle.load(open(filename, "rb"))
-        return workload, args
+        with np.load(filename, allow_pickle=True) as columns:
+            columns = dict(columns)
+        workload = Workload()
+        workload.workload = _columns_to_items(columns)
+        return workload, columns["args"].item()
@@ -12,6 +12,7 @@ limitations under the License.
 """
 
 import math
+import numpy as np
 from utils.utils import CommGroup, CommType, get_args
 
 
@@ -60,3 +61,19 @@ def calc_bw_log(comm_type: CommType, size, duration):  # size: Bytes; duration:
     tput = round(tput, 2)
     busbw = round(busbw, 2)
     return tput, busbw
+
+
+def calc_bw_log_batch(comm_type: np.ndarray, size: np.ndarray, duration: np.ndarray):
+    """Vectorised calc_bw_log, comm_type holds CommType values as str."""
+    n = get_args().world_size
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tput = size / duration
+    busbw = tput.copy()
+    gather = np.isin(comm_type, [CommType.all_gather.value, CommType.reduce_scatter.value])
+    busbw[gather] *= (n - 1) / n
+    busbw[comm_type == CommType.all_reduce.value] *= 2 * (n - 1) / n
+    no_bw = np.isin(
+        comm_type, [CommType.isend.value, CommType.irecv.value, CommType.barrier.value]
+    )
+    tput[no_bw] = busbw[no_bw] = 0
+    return np.round(tput / 1e6, 2), np.round(busbw / 1e6, 2)
@@ -0,0 +1,9 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def aicb_default_args(monkeypatch):
+    # get_args() parses sys.argv on first use, keep pytest's options out of it
+    monkeypatch.setattr(sys, "argv", sys.argv[:1])
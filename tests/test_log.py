@@ -0,0 +1,151 @@
+import random
+
+import numpy as np
+
+from log_analyzer.log import Log, LogItem, Workload, _print_stage_log
+from utils.utils import CommType, CommGroup
+
+
+def _log_item(comm_type, comm_group=None, msg_size=0, elapsed_time=None):
+    item = LogItem(comm_type=comm_type, comm_group=comm_group, msg_size=msg_size)
+    item.elapsed_time = elapsed_time
+    return item
+
+
+def test_workload_dump_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    workload = Workload()
+    workload.append(
+        {
+            "comm_type": CommType.all_reduce,
+            "comm_group": CommGroup.dp_group,
+            "comm_group_size": 8,
+            "msg_size": 1024,
+        }
+    )
+    workload.append(
+        {
+            "comm_type": CommType.computation,
+            "comm_group_size": 1,
+            "msg_size": ((2, 3), (3, 4)),
+            "operation": "fwd",
+        }
+    )
+    workload.append(
+        {
+            "comm_type": CommType.all_gather,
+            "comm_group": CommGroup.tp_group,
+            "comm_group_size": 2,
+            "msg_size": 4096,
+        }
+    )
+    workload.dump({"epoch_num": 1}, "round_trip.csv")
+
+    loaded, args = Workload.load("results/mocked_workload/round_trip_workload.csv")
+
+    assert args == {"epoch_num": 1}
+    assert loaded.workload == workload.workload
+    for item, original in zip(loaded.workload, workload.workload):
+        assert type(item.msg_size) is type(original.msg_size)
+    csv_lines = open("results/mocked_workload/round_trip_workload.csv").readlines()
+    assert csv_lines[1].split(",")[3] == "1024"
+
+
+def test_log_dump_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = Log()
+    for epoch in range(3):
+        log.add_comm_log(
+            _log_item(CommType.all_reduce, CommGroup.dp_group, 1024, 1.0 + epoch)
+        )
+        log.add_comm_log(
+            _log_item(CommType.computation, CommGroup.all, ((2, 3), (3, 4)), 0.5)
+        )
+        log.add_comm_log(_log_item(CommType.epoch_end, elapsed_time=10.0 + epoch))
+    log.add_comm_log(_log_item(CommType.all_gather, CommGroup.tp_group, 4096, 2.0))
+    log.dump("round_trip")
+
+    loaded = Log.load("results/comm_logs/round_trip_log.csv")
+
+    columns, loaded_columns = log._to_columns(), loaded._to_columns()
+    assert columns.keys() == loaded_columns.keys()
+    for name, values in columns.items():
+        np.testing.assert_array_equal(loaded_columns[name], values, err_msg=name)
+    assert loaded.epoch_times == log.epoch_times == [10.0, 11.0, 12.0]
+    assert loaded.comm_logs == log.comm_logs
+    assert loaded.comm_log_each_epoch == log.comm_log_each_epoch
+    assert [len(items) for items in loaded.comm_log_each_epoch] == [2, 2, 2, 1]
+
+
+def _comm_items(epoch):
+    return [
+        _log_item(CommType.all_reduce, CommGroup.dp_group, 1024, 1.0 + epoch),
+        _log_item(CommType.all_gather, CommGroup.tp_group, 4096, 2.0 + epoch),
+        _log_item(CommType.all_reduce, CommGroup.dp_group, 2048, 3.0 + epoch),
+        _log_item(CommType.epoch_end, elapsed_time=10.0 + epoch),
+    ]
+
+
+def _analyze_output(log):
+    output = []
+    comm_info = log.analyze(print_fn=output.append)
+    return output, comm_info
+
+
+def test_log_analyze_incremental_matches_full_recompute():
+    log = Log()
+    for item in _comm_items(0):
+        log.add_comm_log(item)
+    _analyze_output(log)
+    for epoch in (1, 2):
+        for item in _comm_items(epoch):
+            log.add_comm_log(item)
+    _analyze_output(log)
+    incremental = _analyze_output(log)
+
+    full_log = Log()
+    for epoch in (0, 1, 2):
+        for item in _comm_items(epoch):
+            full_log.add_comm_log(item)
+
+    assert incremental == _analyze_output(full_log)
+
+
+def test_log_analyze_returns_a_snapshot():
+    log = Log()
+    for item in _comm_items(0):
+        log.add_comm_log(item)
+    _, comm_info = _analyze_output(log)
+    key = (CommType.all_reduce, CommGroup.dp_group)
+    before = comm_info["init"]["comm_type_info"][key]["_elapsed_time"][:]
+
+    for item in _comm_items(1):
+        log.add_comm_log(item)
+    _, later = _analyze_output(log)
+
+    assert comm_info["init"]["comm_type_info"][key]["_elapsed_time"] == before
+    assert comm_info["train"] == {
+        "count": 1,
+        "comm_type_info": {},
+        "detailed_comm_type_info": {},
+    }
+    assert later["train"]["count"] == 2
+    assert later["train"]["comm_type_info"][key]["_elapsed_time"] == [2.0, 4.0]
+
+
+def _p90(elapsed_time):
+    key = (CommType.all_reduce, CommGroup.dp_group)
+    info = {key: {"count": len(elapsed_time), "_elapsed_time": elapsed_time}}
+    log_str = _print_stage_log(
+        "train", 1, info, ["comm_type", "comm_group"], ["count"], ["_elapsed_time"]
+    )
+    return log_str.split("p90_elapsed_time: ")[1].split()[0]
+
+
+def test_print_stage_log_nearest_rank_p90():
+    elapsed_time = [float(i) for i in range(1, 101)]
+    random.Random(0).shuffle(elapsed_time)
+    # nearest rank: ceil(0.9 * 100) = 90th smallest value
+    assert _p90(elapsed_time) == "90.00"
+    assert _p90([5.0]) == "5.00"
+    assert _p90([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]) == "10.00"
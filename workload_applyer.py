@@ -319,6 +319,9 @@ class WorkloadApplyer:
                 time.sleep(self.gemm_cache[item.msg_size])
 
     def apply_workload(self):
+        # every workload item adds at most one row to the comm log
+        comm_log = bench_logger.comm_log
+        comm_log.reserve(len(comm_log) + len(self.workload.workload))
         torch.cuda.synchronize(self.device)
         start = time.perf_counter()
         key = "backward"
@@ -62,7 +62,6 @@ class Pytorch_trace_analyer(WorkloadGenerator):
                 item.comm_group = CommGroup.dp_group
                 input = node.get("inputs")
                 item.msg_size = input[0][3]
-                item.item_size = input[0][4]
                 self.workload.append(item)
 
 